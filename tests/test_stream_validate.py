@@ -0,0 +1,117 @@
+"""
+stream_validate の検証結果が validate_scenario と一致するかを確認するテスト
+
+stream_validate は STREAM_THRESHOLD 以上の巨大なファイルで、ijsonが利用可能な場合にしか
+使われないため、通常の実行では通らない。小さなシナリオを一時ファイルに書き出して直接呼び出し、
+全体を読み込む検証と同じ結果になることを確かめる。
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# リポジトリ直下の validate_scenario.py を読み込めるようにする
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import validate_scenario  # noqa: E402
+
+# 参照切れ・不正なタイプ・空の選択肢・到達不可能なノードを含むシナリオのノード
+BROKEN_NODES = {
+    'start': {'id': 'start', 'type': 'story', 'text': '始まり', 'next': 'ask'},
+    'ask': {'id': 'ask', 'type': 'choice', 'text': '選択', 'choices': [
+        {'text': '進む', 'next': 'end'},
+        {'text': '', 'next': 'missing'},
+        {'text': '戻る'},
+    ]},
+    'end': {'id': 'end', 'type': 'dialogue', 'speaker': 'A', 'text': '終わり', 'next': None},
+    'empty': {'id': 'empty', 'type': 'choice', 'choices': []},
+    'odd': {'id': 'other', 'type': 'unknown', 'next': None},
+}
+
+
+@unittest.skipIf(validate_scenario.ijson is None, 'ijsonがインストールされていない')
+class StreamValidateTest(unittest.TestCase):
+    """stream_validate と validate_scenario の結果を比較する"""
+
+    def setUp(self):
+        """シナリオを書き出す一時ディレクトリを用意する"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def stream(self, text: str) -> tuple:
+        """
+        JSONテキストを一時ファイルに書き出して stream_validate で検証する
+
+        Args:
+            text: シナリオのJSONテキスト（キーの順序をそのまま保つ）
+
+        Returns:
+            stream_validate の戻り値
+        """
+        path = Path(self.tmp_dir.name) / 'scenario.json'
+        path.write_text(text, encoding='utf-8')
+        return validate_scenario.stream_validate(str(path))
+
+    def assert_same_result(self, scenario: dict, text: str = None):
+        """
+        stream_validate の結果が validate_scenario と一致することを確認する
+
+        エラーメッセージの順序は参照先の存在確認のタイミングにより異なりうるため、集合として比較する。
+
+        Args:
+            scenario: シナリオデータ
+            text: 書き出すJSONテキスト（省略時は scenario をそのままJSONにする）
+        """
+        if text is None:
+            text = json.dumps(scenario, ensure_ascii=False)
+        is_valid, errors, stats, metadata = self.stream(text)
+        expected_valid, expected_errors, expected_stats = validate_scenario.validate_scenario(scenario)
+
+        self.assertEqual(is_valid, expected_valid)
+        self.assertEqual(sorted(errors), sorted(expected_errors))
+        self.assertEqual(stats, expected_stats)
+        self.assertEqual(metadata, scenario.get('metadata', {}))
+
+    def test_bundled_scenario(self):
+        """リポジトリ同梱のシナリオで結果が一致する"""
+        scenario = validate_scenario.load_scenario(str(REPO_DIR / 'scenario.json'))
+        self.assert_same_result(scenario)
+
+    def test_broken_scenario(self):
+        """エラーを含むシナリオで結果が一致する"""
+        self.assert_same_result({'startNode': 'start', 'nodes': BROKEN_NODES})
+
+    def test_start_node_after_nodes(self):
+        """startNode が nodes より後ろにあっても開始ノードとして扱う"""
+        scenario = {'nodes': BROKEN_NODES, 'startNode': 'start', 'metadata': {'title': 't'}}
+        self.assert_same_result(scenario)
+
+        # startNode が存在しないノードを指す場合も、エラーメッセージが一致する
+        self.assert_same_result({'nodes': BROKEN_NODES, 'startNode': 'nowhere'})
+
+    def test_nodes_not_object(self):
+        """nodes がオブジェクトでない場合は、ノードが無いシナリオとして扱う"""
+        for nodes in ('[]', 'null', '"start"', '[{"id": "start"}]'):
+            with self.subTest(nodes=nodes):
+                text = f'{{"startNode": "start", "nodes": {nodes}, "metadata": {{"title": "t"}}}}'
+                is_valid, errors, stats, metadata = self.stream(text)
+                expected = validate_scenario.validate_scenario({'startNode': 'start', 'nodes': {}})
+                self.assertEqual((is_valid, errors, stats), expected)
+                self.assertEqual(metadata, {'title': 't'})
+
+    def test_float_metadata(self):
+        """メタデータの小数はfloatで受け取り、キャッシュにJSONで保存できる"""
+        metadata = {'version': 1.5, 'weights': [0.25, {'rate': 2.5}], 'count': 3}
+        scenario = {'startNode': 'start', 'nodes': BROKEN_NODES, 'metadata': metadata}
+        self.assert_same_result(scenario)
+
+        _, _, _, streamed = self.stream(json.dumps(scenario))
+        self.assertIsInstance(streamed['version'], float)
+        self.assertEqual(json.loads(json.dumps(streamed)), metadata)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,9 +10,58 @@
 5. エンディングノードが正しく設定されているか
 """
 
+import functools
+import hashlib
+import itertools
 import json
+import os
 import sys
-from typing import Set, Dict, List
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    # 高速なJSONパーサー（インストールされていれば大きなシナリオの読み込みに使用する）
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # 逐次JSONパーサー（インストールされていれば巨大なシナリオを省メモリで検証する）
+    import ijson
+except ImportError:
+    ijson = None
+
+# JSONのパースエラーとして扱う例外
+JSON_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
+
+# 検証結果キャッシュの保存先ディレクトリ
+CACHE_DIR = Path.home() / '.cache' / 'novel-tree' / 'validation'
+# 検証ロジックやキャッシュ形式を変更したら更新し、古いキャッシュを無効化する
+CACHE_VERSION = '1'
+# キャッシュに残す検証結果の最大数（古いものから削除する）
+CACHE_MAX_ENTRIES = 16
+# このサイズ（バイト）以上のファイルは、ijsonが利用可能なら逐次パースで検証する
+STREAM_THRESHOLD = 64 * 1024 * 1024
+# ハッシュ計算時にファイルを読み込む単位（バイト）
+HASH_CHUNK_SIZE = 1024 * 1024
+# validate_scenario_cached がプロセス内に保持する検証結果の最大数
+MEMO_SIZE = 32
+
+def parse_scenario(data: bytes) -> Dict:
+    """
+    JSONのバイト列をシナリオデータに変換する
+    
+    Args:
+        data: シナリオファイルの内容
+    
+    Returns:
+        シナリオデータの辞書
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeErrorはjson.JSONDecodeErrorのサブクラス
+        return orjson.loads(data)
+    return json.loads(data)
 
 def load_scenario(filename: str) -> Dict:
     """
@@ -24,138 +73,550 @@ def load_scenario(filename: str) -> Dict:
     Returns:
         シナリオデータの辞書
     """
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(filename, 'rb') as f:
+        return parse_scenario(f.read())
 
-def validate_scenario(scenario: Dict) -> tuple[bool, List[str]]:
+def validate_scenario(scenario: Dict) -> tuple[bool, List[str], Dict[str, int]]:
     """
     シナリオの整合性を検証する
     
+    ノードの検証と統計情報の集計を1回の走査で同時に行い、
+    print_statistics がノードを再走査しなくて済むよう集計結果も返す。
+    
     Args:
         scenario: シナリオデータ
     
     Returns:
-        (成功フラグ, エラーメッセージのリスト)
+        (成功フラグ, エラーメッセージのリスト, 統計情報の辞書)
     """
-    errors = []
     nodes = scenario.get('nodes', {})
-    start_node = scenario.get('startNode')
+    return validate_nodes(scenario.get('startNode'), nodes.items(), nodes)
+
+def validate_scenario_cached(scenario: Dict) -> tuple[bool, List[str], Dict[str, int]]:
+    """
+    同じ内容のシナリオの検証結果をプロセス内で再利用する validate_scenario
     
-    # 1. 開始ノードの存在確認
-    if not start_node:
-        errors.append("❌ 開始ノード（startNode）が定義されていません")
-    elif start_node not in nodes:
-        errors.append(f"❌ 開始ノード '{start_node}' が存在しません")
+    エディタの監視モードやテストなど、同一内容のシナリオを繰り返し検証する呼び出し元向け。
+    エラーメッセージの順序はノードの並び順に依存するため、キーは並び順を保ったJSONとする。
     
-    # 2. 各ノードの検証
-    all_referenced_nodes = set()
+    Args:
+        scenario: シナリオデータ
     
-    for node_id, node in nodes.items():
-        # ノードIDの一致確認
-        if node.get('id') != node_id:
-            errors.append(f"❌ ノード '{node_id}' のIDが一致しません: {node.get('id')}")
-        
-        # ノードタイプの確認
-        node_type = node.get('type')
-        if node_type not in ['story', 'dialogue', 'choice']:
-            errors.append(f"❌ ノード '{node_id}' のタイプが不正です: {node_type}")
-        
-        # 次のノードの確認
-        if node_type in ['story', 'dialogue']:
-            next_node = node.get('next')
-            if next_node:
-                all_referenced_nodes.add(next_node)
-                if next_node not in nodes:
-                    errors.append(f"❌ ノード '{node_id}' が存在しないノード '{next_node}' を参照しています")
-        elif node_type == 'choice':
-            # 選択肢の確認
-            choices = node.get('choices', [])
-            if not choices:
-                errors.append(f"❌ 選択ノード '{node_id}' に選択肢がありません")
-            
-            for i, choice in enumerate(choices):
-                next_node = choice.get('next')
-                if not next_node:
-                    errors.append(f"❌ ノード '{node_id}' の選択肢 {i+1} に次のノードが指定されていません")
-                else:
-                    all_referenced_nodes.add(next_node)
-                    if next_node not in nodes:
-                        errors.append(f"❌ ノード '{node_id}' の選択肢 {i+1} が存在しないノード '{next_node}' を参照しています")
-                
-                if not choice.get('text'):
-                    errors.append(f"❌ ノード '{node_id}' の選択肢 {i+1} にテキストがありません")
+    Returns:
+        (成功フラグ, エラーメッセージのリスト, 統計情報の辞書)
+    """
+    if orjson is not None:
+        key = orjson.dumps(scenario)
+    else:
+        key = json.dumps(scenario, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    is_valid, errors, stats = _validate_serialized(key)
+    # キャッシュ内の結果を呼び出し元に変更されないよう、コピーを返す
+    return is_valid, list(errors), dict(stats)
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _validate_serialized(data: bytes) -> tuple[bool, List[str], Dict[str, int]]:
+    """
+    validate_scenario_cached のキャッシュ本体
     
-    # 3. 到達可能性の確認
-    reachable_nodes = set()
+    Args:
+        data: シナリオをシリアライズしたJSONのバイト列（キャッシュのキー）
+    
+    Returns:
+        (成功フラグ, エラーメッセージのリスト, 統計情報の辞書)
+    """
+    return validate_scenario(parse_scenario(data))
+
+def stream_validate(filename: str) -> tuple[bool, List[str], Dict[str, int], Dict]:
+    """
+    シナリオファイルを逐次パースしながら検証する
+    
+    ノード本体はメモリに保持せず、ノードIDと参照先IDだけを残すため、
+    巨大なシナリオでもファイル全体を読み込まずに検証できる。
+    startNode・nodes・metadata はファイル中の順序によらず1回のパースで集める。
+    参照先の存在確認は全ノードを読み終えてから行うので、
+    エラーメッセージの順序は validate_scenario と異なる場合がある。
+    
+    Args:
+        filename: JSONファイルのパス
     
-    def mark_reachable(node_id: str):
-        """ノードを到達可能としてマークし、その先も再帰的にマーク"""
-        if node_id in reachable_nodes or node_id not in nodes:
-            return
+    Returns:
+        (成功フラグ, エラーメッセージのリスト, 統計情報の辞書, メタデータ)
+    """
+    # nodes 以外のトップレベルの値（startNode, metadata など）
+    top_level = {}
+    with open(filename, 'rb') as f:
+        # 数値はDecimalではなくfloatで受け取り、結果をそのままJSONでキャッシュできるようにする
+        events = ijson.parse(f, use_float=True)
+        node_items = iter_stream_nodes(events, top_level)
+        # ノード列を読み切るとファイルの末尾までパースされ、top_level がそろう
+        errors, stats, node_ids, adjacency, pending_refs = scan_nodes(node_items, None)
+    
+    id2ix = {node_id: ix for ix, node_id in enumerate(node_ids)}  # ノードIDから添字への対応表
+    # 保留していた参照先の存在確認を行い、参照先を添字に変換する
+    for node_id, choice_number, target in pending_refs:
+        if target not in id2ix:
+            errors.append(format_missing_reference(node_id, choice_number, target))
+    adjacency = [[id2ix[target] for target in targets if target in id2ix]
+                 for targets in adjacency]
+    
+    is_valid, errors, stats = check_graph(top_level.get('startNode'), errors, stats,
+                                          node_ids, id2ix, adjacency)
+    return is_valid, errors, stats, top_level.get('metadata', {})
+
+def iter_stream_nodes(events: Iterator[Tuple[str, str, Any]],
+                      top_level: Dict) -> Iterator[Tuple[str, Dict]]:
+    """
+    ijson のパースイベント列から (ノードID, ノード) を1つずつ取り出す
+    
+    nodes 以外のトップレベルの値は top_level に格納する。
+    ノードを取り出し終えた後もファイルの末尾までイベントを読み進めるため、
+    この列を最後まで読むと top_level がそろう。
+    
+    Args:
+        events: ijson.parse のイベント列
+        top_level: nodes 以外のトップレベルの値の格納先
+    
+    Yields:
+        (ノードID, ノード)
+    """
+    for prefix, event, key in events:
+        # トップレベルのキー以外（ルートの開始・終了）は読み飛ばす
+        if prefix != '' or event != 'map_key':
+            continue
         
-        reachable_nodes.add(node_id)
-        node = nodes[node_id]
+        if key != 'nodes':
+            top_level[key] = build_stream_value(events)
+            continue
         
-        if node.get('type') in ['story', 'dialogue']:
-            next_node = node.get('next')
-            if next_node:
-                mark_reachable(next_node)
-        elif node.get('type') == 'choice':
-            for choice in node.get('choices', []):
-                next_node = choice.get('next')
-                if next_node:
-                    mark_reachable(next_node)
-    
-    if start_node and start_node in nodes:
-        mark_reachable(start_node)
-    
-    # 到達不可能なノードを検出
-    unreachable_nodes = set(nodes.keys()) - reachable_nodes
+        _, event, value = next(events)
+        if event != 'start_map':
+            # nodes がオブジェクトでない場合は、ノードが無いものとして読み飛ばす
+            build_stream_value(events, (event, value))
+            continue
+        for _, event, node_id in events:
+            if event == 'end_map':
+                break
+            yield node_id, build_stream_value(events)
+
+def build_stream_value(events: Iterator[Tuple[str, str, Any]],
+                       first: Optional[Tuple[str, Any]] = None) -> Any:
+    """
+    ijson のパースイベント列から値を1つ組み立てる
+    
+    Args:
+        events: ijson.parse のイベント列（値の先頭のイベントから読む）
+        first: 既に読み出した値の先頭のイベント (イベント名, 値)
+    
+    Returns:
+        組み立てた値
+    """
+    if first is not None:
+        events = itertools.chain([('', *first)], events)
+    
+    builder = ijson.ObjectBuilder()
+    depth = 0  # 組み立て中のオブジェクト・配列の入れ子の深さ
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        if depth == 0:
+            return builder.value
+    return builder.value
+
+def validate_nodes(start_node: Optional[str], node_items: Iterable[Tuple[str, Dict]],
+                   known_ids: Iterable[str]) -> tuple[bool, List[str], Dict[str, int]]:
+    """
+    全ノードIDが既知のノード列を1回走査して整合性を検証し、統計情報を集計する
+    
+    内部ではノードIDを整数の添字に置き換えて扱い、文字列に戻すのはエラーメッセージを作るときだけにする。
+    
+    Args:
+        start_node: 開始ノードID
+        node_items: (ノードID, ノード) の列
+        known_ids: node_items に含まれる全ノードID（node_items と同じ順序）
+    
+    Returns:
+        (成功フラグ, エラーメッセージのリスト, 統計情報の辞書)
+    """
+    node_ids = list(known_ids)  # 添字からノードIDへの対応表
+    id2ix = {node_id: ix for ix, node_id in enumerate(node_ids)}  # ノードIDから添字への対応表
+    
+    # 各ノードの検証（統計情報の集計も同じ走査で行う）
+    errors, stats, _, adjacency, _ = scan_nodes(node_items, id2ix)
+    
+    return check_graph(start_node, errors, stats, node_ids, id2ix, adjacency)
+
+def check_graph(start_node: Optional[str], errors: List[str], stats: Dict[str, int],
+                node_ids: List[str], id2ix: Dict[str, int],
+                adjacency: List[List[int]]) -> tuple[bool, List[str], Dict[str, int]]:
+    """
+    ノード単体の検証結果に、開始ノード・到達可能性・エンディングの検証結果を加える
+    
+    validate_nodes と stream_validate の共通処理。
+    
+    Args:
+        start_node: 開始ノードID
+        errors: ノード単体の検証で見つかったエラーメッセージのリスト（追記する）
+        stats: 統計情報の辞書（ノード数を設定する）
+        node_ids: 添字からノードIDへの対応表
+        id2ix: ノードIDから添字への対応表
+        adjacency: 添字ごとの参照先の添字のリスト
+    
+    Returns:
+        (成功フラグ, エラーメッセージのリスト, 統計情報の辞書)
+    """
+    # 1. 開始ノードの存在確認（メッセージは先頭に置く）
+    if not start_node:
+        errors.insert(0, "❌ 開始ノード（startNode）が定義されていません")
+    elif start_node not in id2ix:
+        errors.insert(0, f"❌ 開始ノード '{start_node}' が存在しません")
+    
+    # 2. 各ノードの検証は、呼び出し元が scan_nodes で済ませている（ここではノード数だけを設定する）
+    stats['nodes'] = len(id2ix)
+    
+    # 3. 到達可能性の確認
+    unreachable = find_unreachable(id2ix.get(start_node) if start_node else None, adjacency)
+    # 添字の昇順（ノードの並び順）のリストから直接IDに戻し、集合は作らない
+    # （逐次パースで重複したノードIDは、後に現れたもののみを対象にする）
+    unreachable_nodes = [node_ids[ix] for ix in unreachable if id2ix[node_ids[ix]] == ix]
     if unreachable_nodes:
         errors.append(f"⚠️  到達不可能なノードがあります: {', '.join(sorted(unreachable_nodes))}")
     
     # 4. エンディングノードの確認
-    ending_nodes = [node_id for node_id, node in nodes.items() 
-                    if node.get('next') is None and node.get('type') != 'choice']
-    
-    if not ending_nodes:
+    if not stats['endings']:
         errors.append("❌ エンディングノード（nextがnullのノード）が見つかりません")
     
-    return len(errors) == 0, errors
+    return len(errors) == 0, errors, stats
 
-def print_statistics(scenario: Dict):
+def scan_nodes(node_items: Iterable[Tuple[str, Dict]],
+               id2ix: Optional[Dict[str, int]]) -> tuple[List[str], Dict[str, int], List[str], List[List], List[Tuple]]:
     """
-    シナリオの統計情報を表示する
+    ノード列を走査し、ノード単体の検証・統計の集計・参照先の収集を行う
+    
+    id2ix があれば参照先の存在確認も走査中に行い、無ければ呼び出し元に任せる。
+    開始ノード・到達可能性・エンディングの確認は、全ノードの走査結果が必要なため check_graph で行う。
     
     Args:
-        scenario: シナリオデータ
+        node_items: (ノードID, ノード) の列
+        id2ix: 全ノードIDから添字への対応表（Noneの場合は参照先の存在確認を呼び出し元に任せる）
+    
+    Returns:
+        (エラーメッセージのリスト, 統計情報の辞書, 走査したノードIDのリスト,
+         走査順の参照先のリスト, 存在確認を保留した参照のリスト)。
+        参照先は id2ix があれば添字、無ければノードIDで表し、
+        保留した参照は (参照元ノードID, 選択肢番号またはNone, 参照先ID) で表す
     """
-    nodes = scenario.get('nodes', {})
+    errors = []
+    # ノード種別ごとの数・総選択肢数・エンディング数の集計
+    stats = {'nodes': 0, 'story': 0, 'dialogue': 0, 'choice': 0, 'choices': 0, 'endings': 0}
+    node_ids = []  # 走査したノードID
+    adjacency = []  # 走査順の参照先のリスト
+    pending_refs = []  # 存在確認を保留した参照
     
-    story_nodes = sum(1 for node in nodes.values() if node.get('type') == 'story')
-    dialogue_nodes = sum(1 for node in nodes.values() if node.get('type') == 'dialogue')
-    choice_nodes = sum(1 for node in nodes.values() if node.get('type') == 'choice')
+    # ループ内で繰り返し参照するメソッドはローカル変数に束縛しておく
+    errors_append = errors.append
+    pending_append = pending_refs.append
+    node_ids_append = node_ids.append
+    adjacency_append = adjacency.append
     
-    ending_nodes = [node_id for node_id, node in nodes.items() 
-                    if node.get('next') is None and node.get('type') != 'choice']
+    # 参照の登録処理は、存在確認をここで行うかどうかで分けて一度だけ選ぶ
+    if id2ix is None:
+        def add_reference(targets: List, node_id: str, choice_number: Optional[int], target: str):
+            """参照先をIDのまま targets に登録し、存在確認を呼び出し元に回す"""
+            targets.append(target)
+            pending_append((node_id, choice_number, target))
+    else:
+        id2ix_get = id2ix.get
+        
+        def add_reference(targets: List, node_id: str, choice_number: Optional[int], target: str):
+            """参照先の存在を確認し、添字で targets に登録する"""
+            target_ix = id2ix_get(target)
+            if target_ix is None:
+                errors_append(format_missing_reference(node_id, choice_number, target))
+            else:
+                targets.append(target_ix)
+    
+    for node_id, node in node_items:
+        node_get = node.get
+        node_ids_append(node_id)
+        targets = []  # このノードの参照先（検証関数が add_reference で登録する）
+        adjacency_append(targets)
+        
+        # ノードIDの一致確認
+        declared_id = node_get('id')
+        if declared_id != node_id:
+            errors_append(f"❌ ノード '{node_id}' のIDが一致しません: {declared_id}")
+        
+        # ノードタイプの確認と、種類ごとの検証
+        node_type = node_get('type')
+        validator = NODE_VALIDATORS.get(node_type) if isinstance(node_type, str) else None
+        if validator is None:
+            errors_append(f"❌ ノード '{node_id}' のタイプが不正です: {node_type}")
+            # タイプが不正でも、nextがnullならエンディングとして数える
+            if node_get('next') is None:
+                stats['endings'] += 1
+        else:
+            stats[node_type] += 1
+            validator(node_id, node, stats, targets, errors_append, add_reference)
+    
+    return errors, stats, node_ids, adjacency, pending_refs
+
+def check_linear_node(node_id: str, node: Dict, stats: Dict[str, int], targets: List,
+                      errors_append: Callable[[str], None],
+                      add_reference: Callable[[List, str, Optional[int], str], None]):
+    """
+    ストーリー・会話ノード（nextで次のノードへ進むノード）を検証する
+    
+    scan_nodes がノードの種類ごとに呼び分ける検証関数のひとつ。
+    種類の判定は呼び出し側で済んでいるため、ここでは種類による分岐を行わない。
+    
+    Args:
+        node_id: ノードID
+        node: ノード
+        stats: 統計情報の辞書（エンディング数・選択肢数を加算する）
+        targets: このノードの参照先の登録先（add_reference に渡す）
+        errors_append: エラーメッセージの追加先
+        add_reference: 参照先を登録する関数 (登録先, 参照元ノードID, 選択肢番号またはNone, 参照先ID)
+    """
+    next_node = node.get('next')
+    if next_node is None:
+        stats['endings'] += 1
+    elif next_node:
+        add_reference(targets, node_id, None, next_node)
+
+def check_choice_node(node_id: str, node: Dict, stats: Dict[str, int], targets: List,
+                      errors_append: Callable[[str], None],
+                      add_reference: Callable[[List, str, Optional[int], str], None]):
+    """
+    選択ノードを検証する（引数は check_linear_node と同じ）
+    """
+    choices = node.get('choices', [])
+    stats['choices'] += len(choices)
+    if not choices:
+        errors_append(f"❌ 選択ノード '{node_id}' に選択肢がありません")
+    
+    for i, choice in enumerate(choices):
+        choice_next = choice.get('next')
+        if not choice_next:
+            errors_append(f"❌ ノード '{node_id}' の選択肢 {i+1} に次のノードが指定されていません")
+        else:
+            add_reference(targets, node_id, i + 1, choice_next)
+        
+        if not choice.get('text'):
+            errors_append(f"❌ ノード '{node_id}' の選択肢 {i+1} にテキストがありません")
+
+# ノードの種類ごとの検証関数
+NODE_VALIDATORS = {
+    'story': check_linear_node,
+    'dialogue': check_linear_node,
+    'choice': check_choice_node,
+}
+
+def find_unreachable(start_ix: Optional[int], adjacency: List[List[int]]) -> List[int]:
+    """
+    開始ノードから到達できないノードを求める
     
-    total_choices = sum(len(node.get('choices', [])) 
-                       for node in nodes.values() if node.get('type') == 'choice')
+    到達済みの判定は文字列のハッシュを使わず bytearray の添字参照で行う。
+    再帰呼び出しは深い一本道のシナリオで再帰上限に達するため、明示的なスタックで走査する。
     
+    Args:
+        start_ix: 開始ノードの添字（開始ノードが無い場合はNone）
+        adjacency: 添字ごとの参照先の添字のリスト
+    
+    Returns:
+        到達できないノードの添字のリスト
+    """
+    if start_ix is None:
+        return list(range(len(adjacency)))
+    
+    visited = bytearray(len(adjacency))  # 到達済みなら1
+    
+    stack = [start_ix]  # 未処理のノードの添字を積むスタック
+    while stack:
+        ix = stack.pop()
+        if visited[ix]:
+            continue
+        visited[ix] = 1
+        stack.extend(adjacency[ix])
+    
+    return [ix for ix in range(len(adjacency)) if not visited[ix]]
+
+def format_missing_reference(node_id: str, choice_number: Optional[int], target: str) -> str:
+    """
+    存在しないノードへの参照のエラーメッセージを作成する
+    
+    Args:
+        node_id: 参照元のノードID
+        choice_number: 参照元の選択肢番号（選択肢以外からの参照はNone）
+        target: 参照先のノードID
+    
+    Returns:
+        エラーメッセージ
+    """
+    if choice_number is None:
+        return f"❌ ノード '{node_id}' が存在しないノード '{target}' を参照しています"
+    return f"❌ ノード '{node_id}' の選択肢 {choice_number} が存在しないノード '{target}' を参照しています"
+
+def print_statistics(stats: Dict[str, int], metadata: Dict):
+    """
+    シナリオの統計情報を表示する
+    
+    キャッシュから復元した結果も表示できるよう、シナリオ本体ではなく
+    集計済みの統計情報とメタデータを受け取る。
+    
+    Args:
+        stats: validate_scenario が集計した統計情報
+        metadata: シナリオのメタデータ
+    """
     print("\n📊 シナリオ統計:")
-    print(f"   総ノード数: {len(nodes)}")
-    print(f"   ├─ ストーリーノード: {story_nodes}")
-    print(f"   ├─ 会話ノード: {dialogue_nodes}")
-    print(f"   └─ 選択ノード: {choice_nodes}")
-    print(f"   総選択肢数: {total_choices}")
-    print(f"   エンディング数: {len(ending_nodes)}")
-    
-    metadata = scenario.get('metadata', {})
+    print(f"   総ノード数: {stats['nodes']}")
+    print(f"   ├─ ストーリーノード: {stats['story']}")
+    print(f"   ├─ 会話ノード: {stats['dialogue']}")
+    print(f"   └─ 選択ノード: {stats['choice']}")
+    print(f"   総選択肢数: {stats['choices']}")
+    print(f"   エンディング数: {stats['endings']}")
+    
     if metadata:
         print("\n📝 メタデータ:")
         for key, value in metadata.items():
             print(f"   {key}: {value}")
 
+def get_cache_path(chunks: Iterable[bytes]) -> Path:
+    """
+    シナリオファイルの内容から検証結果キャッシュのパスを求める
+    
+    内容のハッシュをキーにするため、ファイルが変更されれば自動的に別のキャッシュになる。
+    
+    Args:
+        chunks: ファイルの内容を先頭から順に分割したバイト列の列
+    
+    Returns:
+        キャッシュファイルのパス
+    """
+    digest = hashlib.blake2b(digest_size=16, person=f'v{CACHE_VERSION}'.encode())
+    for chunk in chunks:
+        digest.update(chunk)
+    return CACHE_DIR / f"{digest.hexdigest()}.json"
+
+def load_cached_result(cache_path: Path) -> Optional[Dict]:
+    """
+    キャッシュ済みの検証結果を読み込む
+    
+    読み込めた場合は更新時刻を現在時刻にし、prune_cache で削除されにくくする。
+    
+    Args:
+        cache_path: キャッシュファイルのパス
+    
+    Returns:
+        検証結果の辞書（キャッシュが無い・壊れている場合はNone）
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return result
+
+def save_cached_result(cache_path: Path, result: Dict):
+    """
+    検証結果をキャッシュに保存する
+    
+    書き込み途中のファイルを読まれないよう、一時ファイルに書いてから置き換える。
+    キャッシュは高速化のためのものなので、保存に失敗しても無視する。
+    
+    Args:
+        cache_path: キャッシュファイルのパス
+        result: 検証結果の辞書
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        prune_cache(cache_path.parent, CACHE_MAX_ENTRIES)
+    except OSError:
+        pass
+
+def prune_cache(cache_dir: Path, max_entries: int):
+    """
+    キャッシュディレクトリに新しい順で max_entries 件だけ残し、古い検証結果を削除する
+    
+    シナリオを編集するたびに新しいキャッシュが作られるため、放置すると際限なく増える。
+    削除に失敗したファイルは次回の保存時に再度削除を試みる。
+    
+    Args:
+        cache_dir: キャッシュディレクトリ
+        max_entries: 残す検証結果の最大数
+    """
+    entries = []  # (更新時刻, パス) のリスト
+    for path in cache_dir.glob('*.json'):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+def validate_file(filename: str) -> Dict:
+    """
+    シナリオファイルを検証し、表示とキャッシュに必要な結果をまとめる
+    
+    内容が変わっていなければ、前回の検証結果をキャッシュから再利用する。
+    全体を読み込んで検証する場合は、一度だけ読み込んだ内容をハッシュとパースの両方に使い、
+    読み込みの合間にファイルが保存されても、別の内容の検証結果をキャッシュしないようにする。
+    巨大なファイルはijsonが利用可能なら逐次パースで検証し、
+    メモリを使い切らないよう、ハッシュは別に少しずつ読み込んで計算する。
+    
+    Args:
+        filename: JSONファイルのパス
+    
+    Returns:
+        検証結果の辞書（is_valid, errors, stats, metadata）
+    """
+    if ijson is not None and os.path.getsize(filename) >= STREAM_THRESHOLD:
+        with open(filename, 'rb') as f:
+            cache_path = get_cache_path(iter(lambda: f.read(HASH_CHUNK_SIZE), b''))
+        result = load_cached_result(cache_path)
+        if result is not None:
+            return result
+        is_valid, errors, stats, metadata = stream_validate(filename)
+    else:
+        with open(filename, 'rb') as f:
+            data = f.read()
+        cache_path = get_cache_path([data])
+        result = load_cached_result(cache_path)
+        if result is not None:
+            return result
+        scenario = parse_scenario(data)
+        is_valid, errors, stats = validate_scenario(scenario)
+        metadata = scenario.get('metadata', {})
+    
+    result = {
+        'is_valid': is_valid,
+        'errors': errors,
+        'stats': stats,
+        'metadata': metadata,
+    }
+    save_cached_result(cache_path, result)
+    return result
+
 def main():
     """メイン処理"""
     filename = 'scenario.json'
@@ -164,24 +625,23 @@ def main():
     print("=" * 60)
     
     try:
-        scenario = load_scenario(filename)
-        is_valid, errors = validate_scenario(scenario)
+        result = validate_file(filename)
         
-        if is_valid:
+        if result['is_valid']:
             print("\n✅ シナリオファイルは正常です！")
-            print_statistics(scenario)
+            print_statistics(result['stats'], result['metadata'])
             return 0
         else:
             print("\n❌ シナリオファイルにエラーが見つかりました:\n")
-            for error in errors:
+            for error in result['errors']:
                 print(f"   {error}")
-            print_statistics(scenario)
+            print_statistics(result['stats'], result['metadata'])
             return 1
             
     except FileNotFoundError:
         print(f"\n❌ ファイルが見つかりません: {filename}")
         return 1
-    except json.JSONDecodeError as e:
+    except JSON_ERRORS as e:
         print(f"\n❌ JSONパースエラー: {e}")
         return 1
     except Exception as e:
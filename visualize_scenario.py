@@ -5,8 +5,58 @@
 このスクリプトは、シナリオの分岐構造をテキストベースのツリー図として表示します。
 """
 
+import heapq
+import io
 import json
-from typing import Dict, Set
+import operator
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
+try:
+    # 高速なJSONパーサー（インストールされていれば大きなシナリオの読み込みに使用する）
+    import orjson
+except ImportError:
+    orjson = None
+
+# index_scenario が返すインデックス
+# （種類ごとのノードIDリストの辞書, エンディングノードIDのリスト, ノードIDごとの表示用テキスト）
+ScenarioIndex = Tuple[Dict[str, List[str]], List[str], Dict[str, str]]
+
+# 表示用テキストの最大文字数（各表示ではこれ以下の長さに切り詰めて使う）
+DISPLAY_TEXT_LENGTH = 100
+# 表示用テキストで空白に置き換える改行・タブ文字の変換表
+DISPLAY_TRANSLATION = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+# ツリーの枝の記号（末尾フラグを添字にして引く: [途中の子, 末尾の子]）
+BRANCH = ('├── ', '└── ')
+# 子の行に付け足す字下げ（末尾フラグを添字にして引く: [途中の子, 末尾の子]）
+INDENT = ('│   ', '    ')
+# 話者別ノード数で表示する話者の上限数（ノード数の多い順）
+TOP_SPEAKERS = 20
+
+# ノードの種類に応じたアイコン
+NODE_ICONS = {
+    'story': '📖',
+    'dialogue': '💬',
+    'choice': '🔀'
+}
+
+def parse_scenario(data: bytes) -> Dict:
+    """
+    JSONのバイト列をシナリオデータに変換する
+    
+    validate_scenario.py と同じ方法でパースし、BOMの扱いや例外の種類をそろえる。
+    
+    Args:
+        data: シナリオファイルの内容
+    
+    Returns:
+        シナリオデータの辞書
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeErrorはjson.JSONDecodeErrorのサブクラス
+        return orjson.loads(data)
+    return json.loads(data)
 
 def load_scenario(filename: str) -> Dict:
     """
@@ -18,205 +68,306 @@ def load_scenario(filename: str) -> Dict:
     Returns:
         シナリオデータの辞書
     """
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(filename, 'rb') as f:
+        return parse_scenario(f.read())
 
-def visualize_tree(scenario: Dict, max_depth: int = 3):
+def index_scenario(scenario: Dict) -> ScenarioIndex:
+    """
+    ノードの種類別インデックス・エンディング一覧・表示用テキストを作成する
+    
+    各表示関数がそれぞれノード全体を走査して絞り込んだり、
+    テキストの切り詰めと改行の置換を繰り返したりしなくて済むよう、
+    1回の走査でまとめて作成し、main から各関数に渡して使い回す。
+    
+    Args:
+        scenario: シナリオデータ
+    
+    Returns:
+        (種類ごとのノードIDリストの辞書, エンディングノードIDのリスト, ノードIDごとの表示用テキスト)
+    """
+    # 種類ごとのノードIDリスト（未知の種類も種類名をキーとして格納する）
+    by_type = {'story': [], 'dialogue': [], 'choice': []}
+    # エンディングノード（nextがNoneの非選択ノード）のIDリスト
+    endings = []
+    # 先頭 DISPLAY_TEXT_LENGTH 文字に切り詰め、改行・タブを空白にしたテキスト
+    display_texts = {}
+    
+    for node_id, node in scenario.get('nodes', {}).items():
+        node_get = node.get
+        node_type = node_get('type')
+        by_type.setdefault(node_type, []).append(node_id)
+        if node_get('next') is None and node_type != 'choice':
+            endings.append(node_id)
+        display_texts[node_id] = format_display_text(node_get('text', ''))
+    
+    return by_type, endings, display_texts
+
+def format_display_text(text: str) -> str:
+    """
+    ノードのテキストを表示用に整形する
+    
+    index_scenario と、インデックスを渡されずに呼ばれた visualize_tree で同じ整形を行うための共通処理。
+    
+    Args:
+        text: ノードのテキスト
+    
+    Returns:
+        先頭 DISPLAY_TEXT_LENGTH 文字に切り詰め、改行・タブを空白にしたテキスト
+    """
+    return text[:DISPLAY_TEXT_LENGTH].translate(DISPLAY_TRANSLATION)
+
+def visualize_tree(scenario: Dict, max_depth: int = 3, index: Optional[ScenarioIndex] = None,
+                   out: Optional[TextIO] = None):
     """
     シナリオの分岐構造をツリー図として表示する
     
     Args:
         scenario: シナリオデータ
         max_depth: 最大表示深度
+        index: index_scenario の結果（省略時は表示するノードのテキストだけをその場で整形する）
+        out: 出力先（省略時は標準出力）
     """
+    if out is None:
+        out = sys.stdout
+    
     nodes = scenario.get('nodes', {})
     start_node = scenario.get('startNode')
     
+    if index is not None:
+        _, _, display_texts = index
+        display_text = display_texts.__getitem__
+    else:
+        # 浅い階層しか表示しないため、全ノードのインデックスは作らない
+        def display_text(node_id: str) -> str:
+            """表示するノードのテキストだけを整形する"""
+            return format_display_text(nodes[node_id].get('text', ''))
+    
     visited = set()
     
     def print_node(node_id: str, depth: int = 0, prefix: str = "", is_last: bool = True):
-        """ノードを再帰的に表示"""
-        if depth > max_depth or node_id in visited:
-            if depth > max_depth:
-                print(f"{prefix}{'└── ' if is_last else '├── '}... (省略)")
-            return
-        
-        visited.add(node_id)
+        """
+        ノードとその子孫をツリー形式で表示する
         
-        if node_id not in nodes:
-            print(f"{prefix}{'└── ' if is_last else '├── '}❌ [{node_id}] (存在しません)")
-            return
-        
-        node = nodes[node_id]
-        node_type = node.get('type', 'unknown')
-        speaker = node.get('speaker', '')
-        text = node.get('text', '')[:30].replace('\n', ' ')
-        
-        # ノードの種類に応じたアイコン
-        icon = {
-            'story': '📖',
-            'dialogue': '💬',
-            'choice': '🔀'
-        }.get(node_type, '❓')
-        
-        # ノード情報を表示
-        node_info = f"{icon} [{node_id}] {speaker}: {text}..."
-        print(f"{prefix}{'└── ' if is_last else '├── '}{node_info}")
-        
-        # 次のノードを処理
-        next_prefix = prefix + ("    " if is_last else "│   ")
-        
-        if node_type in ['story', 'dialogue']:
-            next_node = node.get('next')
-            if next_node:
-                print_node(next_node, depth + 1, next_prefix, True)
-        elif node_type == 'choice':
-            choices = node.get('choices', [])
-            for i, choice in enumerate(choices):
-                choice_text = choice.get('text', '')[:20]
-                next_node = choice.get('next')
-                is_last_choice = (i == len(choices) - 1)
-                
-                print(f"{next_prefix}{'└── ' if is_last_choice else '├── '}➤ [{choice_text}]")
+        再帰呼び出しでは深いシナリオで再帰上限に達するため、明示的なスタックで走査する。
+        スタックには (ノードID, 深さ, 接頭辞, 末尾フラグ) のタプルか、
+        そのまま出力する選択肢の行（文字列）を積む。
+        行ごとに print すると大きなツリーで遅くなるため、表示順に行を集めて最後にまとめて書き出す。
+        """
+        lines = []  # 表示順に並べたツリーの行
+        lines_append = lines.append
+        stack = [(node_id, depth, prefix, is_last)]  # 未処理の表示要素を積むスタック
+        stack_append = stack.append
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                lines_append(item)
+                continue
+            
+            node_id, depth, prefix, is_last = item
+            if depth > max_depth or node_id in visited:
+                if depth > max_depth:
+                    lines_append(prefix + BRANCH[is_last] + "... (省略)")
+                continue
+            
+            visited.add(node_id)
+            
+            if node_id not in nodes:
+                lines_append("%s%s❌ [%s] (存在しません)" % (prefix, BRANCH[is_last], node_id))
+                continue
+            
+            node_get = nodes[node_id].get
+            node_type = node_get('type', 'unknown')
+            speaker = node_get('speaker', '')
+            text = display_text(node_id)[:30]
+            
+            icon = NODE_ICONS.get(node_type, '❓')
+            
+            # ノード情報を表示（行ごとの書式化は1回の%演算で済ませる）
+            lines_append("%s%s%s [%s] %s: %s..." % (prefix, BRANCH[is_last], icon, node_id, speaker, text))
+            
+            # 次のノードを処理
+            next_prefix = prefix + INDENT[is_last]
+            
+            if node_type in ['story', 'dialogue']:
+                next_node = node_get('next')
                 if next_node:
-                    choice_prefix = next_prefix + ("    " if is_last_choice else "│   ")
-                    print_node(next_node, depth + 1, choice_prefix, True)
+                    stack_append((next_node, depth + 1, next_prefix, True))
+            elif node_type == 'choice':
+                choices = node_get('choices', [])
+                # 先頭の選択肢から表示されるよう、逆順にスタックへ積む
+                for i in range(len(choices) - 1, -1, -1):
+                    choice = choices[i]
+                    choice_text = choice.get('text', '')[:20]
+                    next_node = choice.get('next')
+                    is_last_choice = (i == len(choices) - 1)
+                    
+                    if next_node:
+                        choice_prefix = next_prefix + INDENT[is_last_choice]
+                        stack_append((next_node, depth + 1, choice_prefix, True))
+                    stack_append("%s%s➤ [%s]" % (next_prefix, BRANCH[is_last_choice], choice_text))
+        
+        lines_append('')
+        out.write('\n'.join(lines))
     
-    print("\n🌳 シナリオツリー構造:")
-    print("=" * 80)
+    out.write("\n🌳 シナリオツリー構造:\n")
+    out.write("=" * 80 + "\n")
     if start_node:
         print_node(start_node, 0, "", True)
     else:
-        print("❌ 開始ノードが見つかりません")
+        out.write("❌ 開始ノードが見つかりません\n")
     
-    print("\n" + "=" * 80)
+    out.write("\n" + "=" * 80 + "\n")
 
-def show_choice_points(scenario: Dict):
+def show_choice_points(scenario: Dict, index: Optional[ScenarioIndex] = None, out: Optional[TextIO] = None):
     """
     選択ポイントの一覧を表示する
     
     Args:
         scenario: シナリオデータ
+        index: index_scenario の結果（省略時はここで作成する）
+        out: 出力先（省略時は標準出力）
     """
+    if out is None:
+        out = sys.stdout
+    
     nodes = scenario.get('nodes', {})
-    choice_nodes = [(node_id, node) for node_id, node in nodes.items() 
-                    if node.get('type') == 'choice']
+    by_type, _, display_texts = index or index_scenario(scenario)
     
-    print("\n🔀 選択ポイント一覧:")
-    print("=" * 80)
+    out.write("\n🔀 選択ポイント一覧:\n")
+    out.write("=" * 80 + "\n")
     
-    for i, (node_id, node) in enumerate(choice_nodes, 1):
+    for i, node_id in enumerate(by_type['choice'], 1):
+        node = nodes[node_id]
         speaker = node.get('speaker', '')
-        text = node.get('text', '')[:50].replace('\n', ' ')
+        text = display_texts[node_id][:50]
         choices = node.get('choices', [])
         
-        print(f"\n【選択 {i}】{node_id}")
-        print(f"   {speaker}: {text}...")
-        print(f"   選択肢数: {len(choices)}")
+        out.write(f"\n【選択 {i}】{node_id}\n")
+        out.write(f"   {speaker}: {text}...\n")
+        out.write(f"   選択肢数: {len(choices)}\n")
         
         for j, choice in enumerate(choices, 1):
             choice_text = choice.get('text', '')
             next_node = choice.get('next', '')
             flag = choice.get('flag', '')
-            print(f"      {j}. {choice_text}")
-            print(f"         → {next_node} (フラグ: {flag})")
+            out.write(f"      {j}. {choice_text}\n")
+            out.write(f"         → {next_node} (フラグ: {flag})\n")
     
-    print("\n" + "=" * 80)
+    out.write("\n" + "=" * 80 + "\n")
 
-def show_endings(scenario: Dict):
+def show_endings(scenario: Dict, index: Optional[ScenarioIndex] = None, out: Optional[TextIO] = None):
     """
     エンディング一覧を表示する
     
     Args:
         scenario: シナリオデータ
+        index: index_scenario の結果（省略時はここで作成する）
+        out: 出力先（省略時は標準出力）
     """
-    nodes = scenario.get('nodes', {})
+    if out is None:
+        out = sys.stdout
     
-    # エンディングノードを検索（nextがNoneのノード）
-    ending_nodes = [(node_id, node) for node_id, node in nodes.items() 
-                    if node.get('next') is None and node.get('type') != 'choice']
+    nodes = scenario.get('nodes', {})
+    _, ending_nodes, display_texts = index or index_scenario(scenario)
     
-    print("\n🎬 エンディング一覧:")
-    print("=" * 80)
+    out.write("\n🎬 エンディング一覧:\n")
+    out.write("=" * 80 + "\n")
     
-    for i, (node_id, node) in enumerate(ending_nodes, 1):
+    for i, node_id in enumerate(ending_nodes, 1):
+        node = nodes[node_id]
         speaker = node.get('speaker', '')
-        text = node.get('text', '')[:100].replace('\n', ' ')
+        text = display_texts[node_id]
         
-        print(f"\n【エンディング {i}】{node_id}")
-        print(f"   {speaker}: {text}...")
+        out.write(f"\n【エンディング {i}】{node_id}\n")
+        out.write(f"   {speaker}: {text}...\n")
     
-    print("\n" + "=" * 80)
+    out.write("\n" + "=" * 80 + "\n")
 
-def show_statistics(scenario: Dict):
+def show_statistics(scenario: Dict, index: Optional[ScenarioIndex] = None, out: Optional[TextIO] = None):
     """
     詳細な統計情報を表示する
     
     Args:
         scenario: シナリオデータ
+        index: index_scenario の結果（省略時はここで作成する）
+        out: 出力先（省略時は標準出力）
     """
+    if out is None:
+        out = sys.stdout
+    
     nodes = scenario.get('nodes', {})
+    by_type, _, _ = index or index_scenario(scenario)
     
-    # 各種カウント
-    story_count = sum(1 for node in nodes.values() if node.get('type') == 'story')
-    dialogue_count = sum(1 for node in nodes.values() if node.get('type') == 'dialogue')
-    choice_count = sum(1 for node in nodes.values() if node.get('type') == 'choice')
+    # 各種カウント（種類別の数はインデックスから求める）
+    story_count = len(by_type['story'])
+    dialogue_count = len(by_type['dialogue'])
+    choice_count = len(by_type['choice'])
+    total_choices = sum(len(nodes[node_id].get('choices', [])) for node_id in by_type['choice'])
+    total_text_length = 0  # 全ノードのテキスト文字数の合計
     
-    total_text_length = sum(len(node.get('text', '')) for node in nodes.values())
-    total_choices = sum(len(node.get('choices', [])) 
-                       for node in nodes.values() if node.get('type') == 'choice')
+    # 話者の統計（テキスト文字数と同じ1回の走査で集計する）
+    speakers = Counter()
     
-    # 話者の統計
-    speakers = {}
     for node in nodes.values():
-        speaker = node.get('speaker', 'Unknown')
-        speakers[speaker] = speakers.get(speaker, 0) + 1
+        node_get = node.get
+        total_text_length += len(node_get('text', ''))
+        speakers[node_get('speaker', 'Unknown')] += 1
     
-    print("\n📊 詳細統計:")
-    print("=" * 80)
-    print(f"総ノード数: {len(nodes)}")
-    print(f"  ├─ ストーリーノード: {story_count}")
-    print(f"  ├─ 会話ノード: {dialogue_count}")
-    print(f"  └─ 選択ノード: {choice_count}")
-    print(f"\n総テキスト文字数: {total_text_length:,}文字")
-    print(f"総選択肢数: {total_choices}")
-    print(f"平均選択肢数: {total_choices / choice_count if choice_count > 0 else 0:.1f}")
+    out.write("\n📊 詳細統計:\n")
+    out.write("=" * 80 + "\n")
+    out.write(f"総ノード数: {len(nodes)}\n")
+    out.write(f"  ├─ ストーリーノード: {story_count}\n")
+    out.write(f"  ├─ 会話ノード: {dialogue_count}\n")
+    out.write(f"  └─ 選択ノード: {choice_count}\n")
+    out.write(f"\n総テキスト文字数: {total_text_length:,}文字\n")
+    out.write(f"総選択肢数: {total_choices}\n")
+    out.write(f"平均選択肢数: {total_choices / choice_count if choice_count > 0 else 0:.1f}\n")
     
-    print("\n話者別ノード数:")
-    for speaker, count in sorted(speakers.items(), key=lambda x: x[1], reverse=True):
-        print(f"  {speaker}: {count}ノード")
+    out.write("\n話者別ノード数:\n")
+    # 上位のみ表示するため、全体の並べ替えではなくヒープによる部分ソートを使う
+    top_speakers = heapq.nlargest(TOP_SPEAKERS, speakers.items(), key=operator.itemgetter(1))
+    for speaker, count in top_speakers:
+        out.write(f"  {speaker}: {count}ノード\n")
+    if len(speakers) > TOP_SPEAKERS:
+        out.write(f"  ...他 {len(speakers) - TOP_SPEAKERS} 名\n")
     
-    print("\n" + "=" * 80)
+    out.write("\n" + "=" * 80 + "\n")
 
 def main():
     """メイン処理"""
     filename = 'scenario.json'
+    # 表示内容をまとめてから一度に書き出すためのバッファ
+    out = io.StringIO()
     
-    print("🎮 シナリオ構造の視覚化")
-    print("=" * 80)
+    out.write("🎮 シナリオ構造の視覚化\n")
+    out.write("=" * 80 + "\n")
     
     try:
         scenario = load_scenario(filename)
+        # 種類別インデックスは1回だけ作成し、各表示で使い回す
+        index = index_scenario(scenario)
         
         # 統計情報
-        show_statistics(scenario)
+        show_statistics(scenario, index, out)
         
         # 選択ポイント
-        show_choice_points(scenario)
+        show_choice_points(scenario, index, out)
         
         # エンディング
-        show_endings(scenario)
+        show_endings(scenario, index, out)
         
         # ツリー構造（最初の3階層のみ）
-        print("\n⚠️  ツリー構造は最初の3階層のみ表示します")
-        visualize_tree(scenario, max_depth=3)
+        out.write("\n⚠️  ツリー構造は最初の3階層のみ表示します\n")
+        visualize_tree(scenario, max_depth=3, index=index, out=out)
         
     except FileNotFoundError:
-        print(f"\n❌ ファイルが見つかりません: {filename}")
+        out.write(f"\n❌ ファイルが見つかりません: {filename}\n")
     except json.JSONDecodeError as e:
-        print(f"\n❌ JSONパースエラー: {e}")
+        out.write(f"\n❌ JSONパースエラー: {e}\n")
     except Exception as e:
-        print(f"\n❌ 予期しないエラー: {e}")
+        out.write(f"\n❌ 予期しないエラー: {e}\n")
+    
+    sys.stdout.write(out.getvalue())
 
 if __name__ == '__main__':
     main()